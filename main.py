@@ -7,25 +7,34 @@ from src.logger import setup_logger, get_logger
 from src.document_loader import DocumentLoader
 from src.vector_store import VectorStore
 from src.rag_system import RAGSystem
-from src.embeddings import LocalEmbeddings
+from src.embeddings import get_embeddings, preload_in_background
+from src.embedding_cache import CachedEmbeddings
+from src.query_cache import SemanticQueryCache
+from src.manifest import IndexManifest
 
 logger = get_logger("rag.cli")
 
-def print_banner():
-    print("""
+_BANNER = """
     ======================================
            SISTEMA RAG LOCAL
     ======================================
-    """)
+"""
 
-def print_menu():
-    print("""
+_MENU = """
     1. Indexar documentos
     2. Cargar índice existente
     3. Consultar
     4. Eliminar índice
     5. Salir
-    """)
+"""
+
+def print_banner():
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
+
+def print_menu():
+    sys.stdout.write(_MENU)
+    sys.stdout.flush()
 
 def index_documents(rag: RAGSystem) -> bool:
     """Maneja la indexación desde la UI."""
@@ -49,7 +58,7 @@ def index_documents(rag: RAGSystem) -> bool:
         print(f"[ERROR] {e}")
         return False
 
-def query_loop(rag: RAGSystem):
+def query_loop(rag: RAGSystem, cache: SemanticQueryCache | None = None):
     """Bucle de consultas."""
     print("\n--- Consulta (Escribe 'salir' para terminar) ---")
     while True:
@@ -58,9 +67,15 @@ def query_loop(rag: RAGSystem):
         if not q: continue
 
         try:
-            res = rag.query(q)
-            print(f"\n[R] {res.answer}\n")
-            if src := res.format_sources(): print(src)
+            res, qv = (cache.get(q) if cache else (None, None))
+            if res is None:
+                res = rag.query(q)
+                if cache: cache.put(q, qv, res)
+            # Una sola escritura por respuesta en vez de un print por línea
+            parts = [f"\n[R] {res.answer}\n"]
+            if src := res.format_sources(): parts.append(src + "\n")
+            sys.stdout.writelines(parts)
+            sys.stdout.flush()
         except Exception as e:
             print(f"[ERROR] {e}")
 
@@ -70,13 +85,45 @@ def main():
 
     try:
         settings = get_settings()
-        # Inyección de dependencias explicita
+        # Precarga de pesos en segundo plano: el menú aparece al instante
+        preload_in_background(
+            settings.embedding_model_name,
+            settings.encode_batch_size,
+            device=settings.embedding_device,
+            precision=settings.embedding_precision,
+        )
+        # Inyección de dependencias explicita; get_embeddings comparte la
+        # instancia con la precarga en lugar de construir otra copia.
+        embeddings = CachedEmbeddings(
+            get_embeddings(
+                settings.embedding_model_name,
+                settings.encode_batch_size,
+                settings.embedding_device,
+                settings.embedding_precision,
+            ),
+            cache_dir=os.path.join(settings.vectorstore_path, "embcache"),
+            model_name=settings.embedding_model_name,
+            ttl_seconds=settings.embed_cache_ttl_seconds,
+        )
         rag = RAGSystem(
             settings=settings,
-            vector_store=VectorStore(settings.vectorstore_path, LocalEmbeddings(settings.embedding_model_name)),
-            document_loader=DocumentLoader(settings.chunk_size, settings.chunk_overlap)
+            vector_store=VectorStore(
+                settings.vectorstore_path,
+                embeddings,
+                settings.index_quantization,
+                settings.ingest_batch_size,
+                settings.query_cache_size,
+            ),
+            document_loader=DocumentLoader(
+                settings.chunk_size,
+                settings.chunk_overlap,
+                settings.ingest_workers,
+                tokenizer_model=settings.embedding_model_name if settings.token_chunking else None,
+                manifest=IndexManifest(settings.vectorstore_path),
+            )
         )
-        
+
+        query_cache = SemanticQueryCache(embeddings, settings.semantic_cache_threshold)
         index_loaded = False
 
         while True:
@@ -93,7 +140,7 @@ def main():
                     print("[!] No hay índice guardado")
             elif opt == "3":
                 if index_loaded or rag.vector_store.is_initialized():
-                    query_loop(rag)
+                    query_loop(rag, query_cache)
                 else:
                     print("[!] Carga o indexa documentos primero")
             elif opt == "4":
@@ -1,15 +1,23 @@
 """
 Paquete principal del sistema RAG.
+
+Re-exports perezosos (PEP 562): `import src` no arrastra torch ni langchain;
+cada símbolo importa su módulo la primera vez que se accede.
 """
-from .document_loader import DocumentLoader
-from .embeddings import LocalEmbeddings, get_embeddings
-from .vector_store import VectorStore
-from .rag_system import RAGSystem
+_EXPORTS = {
+    'DocumentLoader': '.document_loader',
+    'LocalEmbeddings': '.embeddings',
+    'get_embeddings': '.embeddings',
+    'CachedEmbeddings': '.embedding_cache',
+    'VectorStore': '.vector_store',
+    'RAGSystem': '.rag_system',
+}
+
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    'DocumentLoader',
-    'LocalEmbeddings',
-    'get_embeddings',
-    'VectorStore',
-    'RAGSystem'
-]
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(module_name, __name__), name)
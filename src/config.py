@@ -1,5 +1,4 @@
 """Configuración del sistema."""
-from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from src.exceptions import ConfigurationError
@@ -20,19 +19,38 @@ class Settings(BaseSettings):
     llm_model_name: str = Field(default="qwen2.5:7b")
     llm_temperature: float = Field(default=0.1, ge=0.0, le=2.0)
     embedding_model_name: str = Field(default="intfloat/multilingual-e5-small")
+    encode_batch_size: int = Field(default=64, gt=0)
+    embedding_device: str | None = Field(default=None)
+    embedding_precision: str = Field(default="fp16")
+    embed_cache_ttl_seconds: int = Field(default=0, ge=0)
+    semantic_cache_threshold: float = Field(default=0.97, ge=0.0, le=1.0)
 
     # Vector Store
     vectorstore_path: str = Field(default="./vectorstore")
+    index_quantization: str = Field(default="none", pattern="^(none|sq8)$")
+    ingest_batch_size: int = Field(default=256, gt=0)
+    query_cache_size: int = Field(default=1024, gt=0)
 
     # Procesamiento
     chunk_size: int = Field(default=1000, gt=0)
     chunk_overlap: int = Field(default=200, ge=0)
     retrieval_k: int = Field(default=4, gt=0)
+    ingest_workers: int = Field(default=0, ge=0)
+    token_chunking: bool = Field(default=False)
+
+_SETTINGS: Settings | None = None
 
-@lru_cache
 def get_settings() -> Settings:
-    """Singleton de configuración."""
-    try:
-        return Settings()
-    except Exception as e:
-        raise ConfigurationError(f"Error de configuración: {e}") from e
+    """Singleton de configuración: el entorno se parsea una sola vez por proceso."""
+    global _SETTINGS
+    if _SETTINGS is None:
+        try:
+            _SETTINGS = Settings()
+        except Exception as e:
+            raise ConfigurationError(f"Error de configuración: {e}") from e
+    return _SETTINGS
+
+def reset_settings() -> None:
+    """Descarta el singleton; pensado para tests."""
+    global _SETTINGS
+    _SETTINGS = None
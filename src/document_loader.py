@@ -1,29 +1,96 @@
 """Carga y procesamiento de documentos (PDF, TXT, DOCX, MD)."""
+import asyncio
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator
 from langchain_core.documents import Document
 from langchain_community.document_loaders import PyPDFLoader, TextLoader, Docx2txtLoader, UnstructuredMarkdownLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from src.exceptions import DocumentLoadError, DocumentNotFoundError, UnsupportedFormatError
+from src.fast_splitter import FastSplitter
 from src.logger import get_logger
 
 logger = get_logger("rag.document_loader")
 
-SUPPORTED = {
+# Registro precompilado extensión→factoría: despacho O(1) por dict en vez
+# de cadenas if/elif, con las clases ya resueltas a nivel de módulo.
+_LOADERS = {
     ".pdf": PyPDFLoader,
     ".txt": lambda p: TextLoader(p, encoding="utf-8"),
     ".docx": Docx2txtLoader,
     ".md": UnstructuredMarkdownLoader,
 }
 
+SUPPORTED_EXTENSIONS = frozenset(_LOADERS)
+
+@lru_cache(maxsize=16)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> FastSplitter:
+    """Un splitter compartido por cada combinación (size, overlap); es sin
+    estado, así que los loaders lo fijan una vez en __init__ y ninguna llamada
+    a split paga construcción ni recompilación de separadores."""
+    return FastSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+@lru_cache(maxsize=4)
+def _get_token_splitter(tokenizer_model: str, chunk_size: int, chunk_overlap: int):
+    """Splitter que mide en tokens del modelo de embeddings (chunk_size en tokens).
+
+    Import perezoso: transformers solo se paga si el chunking por tokens
+    está activado.
+    """
+    from transformers import AutoTokenizer
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_model, use_fast=True)
+    return RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+        tokenizer, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+
+def _iter_supported_files(root: str):
+    """Recorre el árbol con scandir, filtrando por extensión antes de stat.
+
+    En Linux is_dir/is_file usan el d_type cacheado del directorio; los
+    archivos con extensión no soportada se descartan sin syscall extra.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif os.path.splitext(e.name)[1].lower() in SUPPORTED_EXTENSIONS and e.is_file(follow_symlinks=False):
+                    yield e.path
+
+def _load_one(file_path: str) -> list[Document]:
+    """Carga un archivo; a nivel de módulo para que sea picklable por el pool."""
+    ext = os.path.splitext(file_path)[1].lower()
+    try:
+        return _LOADERS[ext](file_path).load()
+    except Exception as e:
+        raise DocumentLoadError(f"Error cargando {file_path}", str(e)) from e
+
 class DocumentLoader:
     """Procesa documentos de diversos formatos."""
 
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        workers: int = 1,
+        tokenizer_model: str | None = None,
+        manifest=None,
+    ):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len
-        )
+        # 0 = automático (un proceso por CPU); 1 = carga secuencial
+        self.workers = workers
+        # IndexManifest opcional: permite saltar archivos ya indexados
+        self.manifest = manifest
+        if tokenizer_model:
+            # Con tokenizer, chunk_size/chunk_overlap se interpretan en tokens.
+            self.splitter = _get_token_splitter(tokenizer_model, chunk_size, chunk_overlap)
+        else:
+            self.splitter = _get_splitter(chunk_size, chunk_overlap)
 
     def load_document(self, file_path: str) -> list[Document]:
         """Carga un único archivo si el formato es soportado."""
@@ -31,40 +98,145 @@ class DocumentLoader:
             raise DocumentNotFoundError(file_path)
 
         ext = os.path.splitext(file_path)[1].lower()
-        if ext not in SUPPORTED:
+        if ext not in SUPPORTED_EXTENSIONS:
             raise UnsupportedFormatError(ext)
 
         try:
-            loader = SUPPORTED[ext](file_path)
+            loader = _LOADERS[ext](file_path)
             docs = loader.load()
-            logger.info(f"Cargado: {os.path.basename(file_path)} ({len(docs)} págs)")
+            logger.info("Cargado: %s (%d págs)", os.path.basename(file_path), len(docs))
             return docs
         except (DocumentNotFoundError, UnsupportedFormatError):
             raise
         except Exception as e:
             raise DocumentLoadError(f"Error cargando {file_path}", str(e)) from e
 
-    def load_directory(self, directory_path: str) -> list[Document]:
-        """Carga todos los archivos soportados de un directorio."""
+    def load_directory(self, directory_path: str, parallel: bool = True) -> list[Document]:
+        """Carga todos los archivos soportados de un directorio.
+
+        Por defecto los archivos se cargan con un pool de hilos (los parsers
+        liberan el GIL en I/O); con workers > 1 el parseo CPU-bound pasa a un
+        pool de procesos. parallel=False fuerza la carga secuencial cuando el
+        orden determinista importa.
+        """
         if not os.path.exists(directory_path):
             raise DocumentNotFoundError(directory_path)
 
+        logger.info("Escaneando: %s", directory_path)
+
+        paths = list(_iter_supported_files(directory_path))
+
+        if self.manifest is not None:
+            fresh = [p for p in paths if not self.manifest.is_unchanged(p)]
+            if any(self.manifest.is_known(p) for p in fresh):
+                # Un archivo ya indexado cambió: HNSW no soporta borrado,
+                # sus chunks viejos quedarían en el índice. Invalidar el
+                # manifiesto fuerza la reconstrucción completa.
+                logger.info("Archivos modificados: reconstrucción completa del índice")
+                self.manifest.clear()
+            elif len(fresh) < len(paths):
+                # Solo archivos nuevos: se anexan sobre el índice existente.
+                logger.info("Sin cambios (manifiesto): %d archivos", len(paths) - len(fresh))
+                paths = fresh
+
+        workers = self.workers or (os.cpu_count() or 1)
         docs = []
-        logger.info(f"Escaneando: {directory_path}")
-
-        for f in os.listdir(directory_path):
-            full_path = os.path.join(directory_path, f)
-            if not os.path.isfile(full_path): continue
-            
-            try:
-                if os.path.splitext(f)[1].lower() in SUPPORTED:
-                    docs.extend(self.load_document(full_path))
-            except DocumentLoadError as e:
-                logger.warning(str(e))
-
-        logger.info(f"Total procesado: {len(docs)} documentos")
+        if workers > 1 and len(paths) > 1:
+            # El parseo de PDF/DOCX es CPU-bound e independiente por archivo.
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as ex:
+                futures = {ex.submit(_load_one, p): p for p in paths}
+                for fut in as_completed(futures):
+                    try:
+                        docs.extend(fut.result())
+                        if self.manifest is not None:
+                            self.manifest.update(futures[fut])
+                    except DocumentLoadError as e:
+                        logger.warning(str(e))
+        elif parallel and len(paths) > 1:
+            # Hilos: sin coste de pickle/fork y load_document sigue siendo
+            # el punto de extensión (los tests lo parchean en la instancia).
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2)) as ex:
+                futures = {ex.submit(self.load_document, p): p for p in paths}
+                for fut in as_completed(futures):
+                    try:
+                        docs.extend(fut.result())
+                        if self.manifest is not None:
+                            self.manifest.update(futures[fut])
+                    except DocumentLoadError as e:
+                        logger.warning(str(e))
+        else:
+            for p in paths:
+                try:
+                    docs.extend(self.load_document(p))
+                    if self.manifest is not None:
+                        self.manifest.update(p)
+                except DocumentLoadError as e:
+                    logger.warning(str(e))
+
+        # Las huellas quedan en staging: quien persista el índice confirma
+        # con manifest.commit(); una carga sin persist no marca nada indexado.
+        logger.info("Total procesado: %d documentos", len(docs))
         return docs
 
+    def iter_split_documents(self, documents: list[Document]) -> Iterator[Document]:
+        """Genera chunks uno a uno, sin materializar la lista completa."""
+        for doc in documents:
+            yield from self.splitter.split_documents([doc])
+
+    def split_documents(self, documents: list[Document]) -> list[Document]:
+        """Divide documentos en chunks (lista completa, para llamadores simples)."""
+        return list(self.iter_split_documents(documents))
+
+    def iter_chunks(self, source_path: str, batch_size: int = 1024):
+        """Genera lotes de chunks listos para indexar.
+
+        Divide documento a documento y entrega lotes de `batch_size`, de modo
+        que la indexación avanza con memoria constante en vez de materializar
+        el corpus completo.
+        """
+        if os.path.isfile(source_path):
+            raw_docs = self.load_document(source_path)
+        elif os.path.isdir(source_path):
+            raw_docs = self.load_directory(source_path)
+        else:
+            raise DocumentNotFoundError(source_path)
+
+        chunks = self.iter_split_documents(raw_docs)
+        while batch := list(islice(chunks, batch_size)):
+            yield batch
+
+    async def aprocess_documents(self, source_path: str) -> list[Document]:
+        """Variante async de process_documents para llamadores con event loop.
+
+        Los archivos se cargan en paralelo vía run_in_executor sobre el pool
+        de procesos, manteniendo el loop libre mientras se parsea.
+        """
+        if os.path.isfile(source_path):
+            paths = [source_path]
+        elif os.path.isdir(source_path):
+            paths = list(_iter_supported_files(source_path))
+        else:
+            raise DocumentNotFoundError(source_path)
+
+        loop = asyncio.get_running_loop()
+        workers = self.workers or (os.cpu_count() or 1)
+        raw_docs: list[Document] = []
+        with ProcessPoolExecutor(max_workers=min(max(workers, 1), max(len(paths), 1))) as ex:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(ex, _load_one, p) for p in paths),
+                return_exceptions=True,
+            )
+        for res in results:
+            if isinstance(res, DocumentLoadError):
+                logger.warning(str(res))
+            elif isinstance(res, BaseException):
+                raise res
+            else:
+                raw_docs.extend(res)
+
+        if not raw_docs: return []
+        return self.splitter.split_documents(raw_docs)
+
     def process_documents(self, source_path: str) -> list[Document]:
         """Carga y divide documentos desde archivo o carpeta."""
         if os.path.isfile(source_path):
@@ -75,7 +247,7 @@ class DocumentLoader:
             raise DocumentNotFoundError(source_path)
 
         if not raw_docs: return []
-        
-        chunks = self.splitter.split_documents(raw_docs)
-        logger.info(f"Generados {len(chunks)} chunks")
+
+        chunks = self.split_documents(raw_docs)
+        logger.info("Generados %d chunks", len(chunks))
         return chunks
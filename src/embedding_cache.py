@@ -0,0 +1,94 @@
+"""Cache persistente de embeddings direccionado por contenido."""
+import hashlib
+import os
+import sqlite3
+import time
+import numpy as np
+from typing import List
+from langchain_core.embeddings import Embeddings
+from src.logger import get_logger
+
+logger = get_logger("rag.embedding_cache")
+
+def _key(model_name: str, text: str) -> bytes:
+    """Hash estable de (modelo, texto); textos idénticos comparten embedding."""
+    return hashlib.blake2b(model_name.encode("utf-8") + b"\x00" + text.encode("utf-8"), digest_size=32).digest()
+
+class CachedEmbeddings(Embeddings):
+    """Envuelve un modelo de embeddings con un KV SQLite hash -> vector.
+
+    Los textos ya vistos (re-indexaciones, chunks duplicados) se resuelven
+    con una lectura de disco en lugar de un forward del encoder.
+    """
+
+    def __init__(self, inner: Embeddings, cache_dir: str, model_name: str, ttl_seconds: int = 0):
+        self._inner = inner
+        self._model_name = model_name
+        self._ttl = ttl_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, "embcache.db"), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB, created REAL)")
+        self._db.commit()
+
+    def _get(self, key: bytes) -> np.ndarray | None:
+        row = self._db.execute("SELECT vec, created FROM embeddings WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self._ttl and time.time() - row[1] > self._ttl:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def _put_many(self, keys: list[bytes], vecs: np.ndarray) -> None:
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vec, created) VALUES (?, ?, ?)",
+            [(k, np.asarray(v, dtype=np.float32).tobytes(), now) for k, v in zip(keys, vecs)],
+        )
+        self._db.commit()
+
+    def embed_documents_np(self, texts: List[str]) -> np.ndarray:
+        """Embeddings como array float32 (n, d), resolviendo duplicados desde el cache."""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        keys = [_key(self._model_name, t) for t in texts]
+        hits: dict[int, np.ndarray] = {}
+        miss_idx: list[int] = []
+        for i, k in enumerate(keys):
+            vec = self._get(k)
+            if vec is not None:
+                hits[i] = vec
+            else:
+                miss_idx.append(i)
+
+        if miss_idx:
+            miss_texts = [texts[i] for i in miss_idx]
+            if hasattr(self._inner, "embed_documents_np"):
+                new_vecs = self._inner.embed_documents_np(miss_texts)
+            else:
+                new_vecs = np.asarray(self._inner.embed_documents(miss_texts), dtype=np.float32)
+            self._put_many([keys[i] for i in miss_idx], new_vecs)
+            for i, vec in zip(miss_idx, new_vecs):
+                hits[i] = vec
+
+        logger.info("Cache de embeddings: %d/%d hits", len(texts) - len(miss_idx), len(texts))
+        return np.stack([hits[i] for i in range(len(texts))])
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings de textos (frontera langchain)."""
+        return self.embed_documents_np(texts).tolist()
+
+    def embed_query_np(self, text: str) -> np.ndarray:
+        """Embedding de consulta como array float32 (d,), con cache."""
+        key = _key(self._model_name, text)
+        vec = self._get(key)
+        if vec is None:
+            if hasattr(self._inner, "embed_query_np"):
+                vec = self._inner.embed_query_np(text)
+            else:
+                vec = np.asarray(self._inner.embed_query(text), dtype=np.float32)
+            self._put_many([key], vec[None, :])
+        return vec
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embedding de consulta (frontera langchain)."""
+        return self.embed_query_np(text).tolist()
@@ -1,31 +1,179 @@
 """Embeddings locales usando sentence-transformers."""
+import os
+import threading
+from functools import lru_cache
 from typing import List
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 from langchain_core.embeddings import Embeddings
+from src.logger import get_logger
+
+logger = get_logger("rag.embeddings")
+
+# Bloques grandes para no materializar todo el corpus de golpe en memoria.
+_ENCODE_BLOCK = 1024
+
+# Escala fija de cuantización: vectores normalizados viven en [-1, 1].
+_INT8_SCALE = 127.0
+
+def _quantize_int8(vecs: np.ndarray) -> np.ndarray:
+    """Cuantiza vectores normalizados a int8 (4x menos memoria, <1% de recall)."""
+    return np.clip(np.round(vecs * _INT8_SCALE), -128, 127).astype(np.int8)
+
+def _resolve_device(device: str | None) -> str:
+    """Prioridad: argumento > variable de entorno > autodetección CUDA."""
+    return device or os.environ.get("RAG_EMBED_DEVICE") or ("cuda" if torch.cuda.is_available() else "cpu")
+
+def preload_in_background(
+    model_name: str,
+    encode_batch_size: int = 64,
+    device: str | None = None,
+    precision: str = "fp16",
+) -> threading.Thread:
+    """Carga los pesos en un hilo daemon mientras la UI sigue respondiendo.
+
+    Calienta la misma instancia compartida de get_embeddings(): si alguien
+    pide el modelo antes de que termine, espera la carga en vuelo (lock de
+    la instancia) en lugar de cargar una segunda copia de los pesos.
+    """
+
+    def _load():
+        get_embeddings(model_name, encode_batch_size, device, precision).model
+
+    thread = threading.Thread(target=_load, daemon=True)
+    thread.start()
+    return thread
 
 class LocalEmbeddings(Embeddings):
-    """Wrapper para usar modelos de embeddings locales."""
+    """Wrapper para usar modelos de embeddings locales.
+
+    Todos los vectores salen normalizados L2: el índice puede usar producto
+    interno puro (equivale a coseno) sin renormalizar en cada consulta.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "intfloat/multilingual-e5-small",
+        encode_batch_size: int = 64,
+        device: str | None = None,
+        precision: str = "fp16",
+    ):
+        self._model_name = model_name
+        self._device = device
+        self._precision = precision
+        self.encode_batch_size = encode_batch_size
+        self._model: SentenceTransformer | None = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self) -> SentenceTransformer:
+        """Carga el modelo en el primer uso; instanciar la clase es gratis.
 
-    def __init__(self, model_name: str = "intfloat/multilingual-e5-small"):
-        print(f"[*] Cargando embeddings: {model_name}...")
-        self.model = SentenceTransformer(model_name)
-        print(f"[OK] Modelo cargado")
+        Doble chequeo con lock: un acceso concurrente (p. ej. la precarga en
+        segundo plano frente al primer uso real) espera la carga en vuelo en
+        lugar de duplicar los pesos en memoria.
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    device = _resolve_device(self._device)
+                    logger.info("Cargando embeddings: %s (%s)...", self._model_name, device)
+                    model = SentenceTransformer(self._model_name, device=device)
+                    if self._precision == "fp16" and device.startswith("cuda"):
+                        # fp16 solo en GPU: en CPU sentence-transformers es más lento en half.
+                        model.half()
+                    self._model = model
+                    logger.info("Modelo cargado")
+        return self._model
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Codifica por bloques y concatena; evita listas gigantes intermedias.
+
+        Los textos se ordenan por longitud antes de codificar para que cada
+        batch pague el padding de secuencias parecidas, y se des-ordenan al
+        final para mantener la correspondencia con la entrada.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        order = np.argsort(np.fromiter((len(t) for t in texts), dtype=np.int32, count=len(texts)), kind="stable")
+        ordered = [texts[i] for i in order]
+        parts = [
+            self.model.encode(
+                ordered[i:i + _ENCODE_BLOCK],
+                batch_size=self.encode_batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+            for i in range(0, len(ordered), _ENCODE_BLOCK)
+        ]
+        out = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return out[np.argsort(order, kind="stable")]
+
+    def embed_documents_np(self, texts: List[str]) -> np.ndarray:
+        """Embeddings como array float32 (n, d) contiguo; la ruta caliente.
+
+        Evita materializar floats de Python: FAISS/Chroma consumen el array
+        directamente, sin el ~7x de memoria de una lista de listas.
+        """
+        return self._encode(texts)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Genera embeddings para una lista de textos."""
+        """Genera embeddings para una lista de textos (frontera langchain)."""
+        return self.embed_documents_np(texts).tolist()
+
+    def embed_documents_int8(self, texts: List[str]) -> np.ndarray:
+        """Embeddings cuantizados a int8, para índices con scalar quantizer."""
+        return _quantize_int8(self.embed_documents_np(texts))
+
+    def embed_query_np(self, text: str) -> np.ndarray:
+        """Embedding de consulta como array float32 (d,); la ruta caliente."""
         return self.model.encode(
-            texts, 
-            show_progress_bar=False, 
-            convert_to_numpy=True
-        ).tolist()
+            text,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32, copy=False)
 
     def embed_query(self, text: str) -> List[float]:
-        """Genera embedding para una consulta."""
-        return self.model.encode(
-            text, 
-            show_progress_bar=False, 
-            convert_to_numpy=True
-        ).tolist()
+        """Genera embedding para una consulta (frontera langchain)."""
+        return self.embed_query_np(text).tolist()
+
+    def embed_query_tensor(self, text: str) -> torch.Tensor:
+        """Embedding de consulta como tensor en el dispositivo del modelo.
+
+        Evita la copia GPU->CPU cuando la búsqueda puede consumir el tensor
+        directamente; inference_mode es estrictamente más barato que no_grad.
+        """
+        with torch.inference_mode():
+            return self.model.encode(
+                text,
+                show_progress_bar=False,
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+            )
+
+    def embed_query_int8(self, text: str) -> np.ndarray:
+        """Embedding de consulta cuantizado con la misma escala que los documentos."""
+        return _quantize_int8(np.asarray(self.embed_query(text), dtype=np.float32))
+
+@lru_cache(maxsize=4)
+def _get_embeddings_cached(
+    model_name: str, encode_batch_size: int, device: str | None, precision: str
+) -> LocalEmbeddings:
+    return LocalEmbeddings(model_name, encode_batch_size, device, precision)
+
+def get_embeddings(
+    model_name: str = "intfloat/multilingual-e5-small",
+    encode_batch_size: int = 64,
+    device: str | None = None,
+    precision: str = "fp16",
+) -> LocalEmbeddings:
+    """Instancia compartida por configuración: los pesos del modelo se cargan
+    una sola vez aunque varios componentes pidan los mismos embeddings.
 
-def get_embeddings() -> LocalEmbeddings:
-    return LocalEmbeddings()
+    Envuelve la versión cacheada con los argumentos ya explícitos: llamar
+    con defaults omitidos o escritos produce la misma clave de cache (el
+    lru_cache crudo las trataría como entradas distintas)."""
+    return _get_embeddings_cached(model_name, encode_batch_size, device, precision)
@@ -0,0 +1,73 @@
+"""División de texto en chunks en una sola pasada con regex precompilada."""
+import re
+import numpy as np
+from langchain_core.documents import Document
+
+# Límites de párrafo, fin de oración o salto de línea, compilados una vez.
+_SEP_RE = re.compile(r"\n\n+|(?<=[.!?])\s+|\n")
+
+def _pack(bounds: np.ndarray, text_len: int, chunk_size: int, overlap: int) -> np.ndarray:
+    """Empaqueta offsets de límites en ventanas [start, end) con solapamiento.
+
+    Aritmética entera pura sobre los offsets; los cortes caen en el último
+    límite que cabe en la ventana, o en duro si un segmento excede chunk_size.
+    Retorna un array (n_chunks, 2) de pares [start, end).
+    """
+    step = chunk_size - overlap
+    if step < 1:
+        step = 1
+    # Capacidad estimada para el caso típico. No es una cota: un límite justo
+    # por encima de `start` solo garantiza avanzar 1 carácter por iteración,
+    # así que el buffer se duplica cuando se llena.
+    out = np.empty((2 * (text_len // step) + 4, 2), dtype=np.int64)
+    n = 0
+    start = 0
+    while start < text_len:
+        if n == out.shape[0]:
+            bigger = np.empty((2 * out.shape[0], 2), dtype=np.int64)
+            bigger[:n] = out
+            out = bigger
+        end = start + chunk_size
+        if end >= text_len:
+            out[n, 0] = start
+            out[n, 1] = text_len
+            n += 1
+            break
+        idx = np.searchsorted(bounds, end, side="right") - 1
+        if idx >= 0 and bounds[idx] > start:
+            end = bounds[idx]
+        out[n, 0] = start
+        out[n, 1] = end
+        n += 1
+        nxt = end - overlap
+        start = nxt if nxt > start else end
+    return out[:n]
+
+try:
+    from numba import njit
+    _pack = njit(cache=True)(_pack)
+except ImportError:  # numba es un acelerador opcional; el bucle puro funciona igual
+    pass
+
+class FastSplitter:
+    """Divisor de documentos basado en offsets; mismo contrato que el splitter de LangChain."""
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> list[str]:
+        """Divide un texto respetando límites de oración/párrafo."""
+        if not text:
+            return []
+        bounds = np.fromiter((m.end() for m in _SEP_RE.finditer(text)), dtype=np.int64)
+        pairs = _pack(bounds, len(text), self.chunk_size, self.chunk_overlap)
+        return [piece for s, e in pairs if (piece := text[s:e].strip())]
+
+    def split_documents(self, documents: list[Document]) -> list[Document]:
+        """Divide documentos en chunks preservando su metadata."""
+        return [
+            Document(page_content=piece, metadata=dict(doc.metadata))
+            for doc in documents
+            for piece in self.split_text(doc.page_content)
+        ]
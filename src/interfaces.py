@@ -3,6 +3,7 @@ Interfaces (Protocols) para inyección de dependencias.
 Permiten desacoplar las implementaciones concretas y facilitar el testing.
 """
 from typing import Protocol, runtime_checkable
+import numpy as np
 from langchain_core.documents import Document
 
 
@@ -26,6 +27,14 @@ class DocumentLoaderInterface(Protocol):
         """Procesa documentos desde archivo o directorio."""
         ...
 
+    async def aprocess_documents(self, source_path: str) -> list[Document]:
+        """Procesa documentos de forma asíncrona."""
+        ...
+
+    def iter_chunks(self, source_path: str, batch_size: int = 1024):
+        """Genera lotes de chunks desde archivo o directorio."""
+        ...
+
 
 @runtime_checkable
 class VectorStoreInterface(Protocol):
@@ -35,6 +44,14 @@ class VectorStoreInterface(Protocol):
         """Crea un vector store desde documentos."""
         ...
 
+    def add_documents(self, documents: list[Document]) -> None:
+        """Añade un lote de documentos al vector store (sin persistir)."""
+        ...
+
+    def persist(self) -> None:
+        """Persiste el vector store a disco."""
+        ...
+
     def load_vectorstore(self) -> bool:
         """Carga un vector store existente."""
         ...
@@ -47,6 +64,14 @@ class VectorStoreInterface(Protocol):
         """Realiza búsqueda por similitud."""
         ...
 
+    def similarity_search_batch(
+        self,
+        queries: list[str],
+        k: int = 4,
+    ) -> list[list[tuple[Document, float]]]:
+        """Realiza búsquedas por similitud para varias consultas."""
+        ...
+
     def delete_vectorstore(self) -> None:
         """Elimina el vector store."""
         ...
@@ -55,17 +80,33 @@ class VectorStoreInterface(Protocol):
         """Verifica si el vector store está inicializado."""
         ...
 
+    def size(self) -> int:
+        """Número de vectores en el índice."""
+        ...
+
+    def reset(self) -> None:
+        """Descarta el índice en memoria sin tocar el disco."""
+        ...
+
 
 @runtime_checkable
 class EmbeddingsInterface(Protocol):
     """Interface para modelos de embeddings."""
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        """Genera embeddings para una lista de textos."""
+        """Genera embeddings para una lista de textos (frontera langchain)."""
         ...
 
     def embed_query(self, text: str) -> list[float]:
-        """Genera embedding para una consulta."""
+        """Genera embedding para una consulta (frontera langchain)."""
+        ...
+
+    def embed_documents_np(self, texts: list[str]) -> np.ndarray:
+        """Embeddings como array float32 contiguo (n, dim); la ruta caliente."""
+        ...
+
+    def embed_query_np(self, text: str) -> np.ndarray:
+        """Embedding de consulta como array float32 (dim,)."""
         ...
 
 
@@ -2,32 +2,38 @@
 Logger centralizado para el sistema RAG.
 """
 import logging
+import re
 import sys
 from typing import Literal
 
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
-_SENSITIVE_KEYS = frozenset({
+_SENSITIVE_KEYS = (
     "api_key",
     "openai_api_key",
     "password",
     "secret",
     "token",
     "authorization",
-})
+)
+
+# Compilado una vez al importar: un solo pase por mensaje, sin .lower()
+_SENSITIVE_RE = re.compile("|".join(map(re.escape, _SENSITIVE_KEYS)), re.IGNORECASE)
 
 
 class SensitiveDataFilter(logging.Filter):
     """Filtro para evitar loggear información sensible."""
 
     def filter(self, record: logging.LogRecord) -> bool:
-        """Filtra y sanitiza mensajes con datos sensibles."""
-        if hasattr(record, "msg") and isinstance(record.msg, str):
-            msg_lower = record.msg.lower()
-            for key in _SENSITIVE_KEYS:
-                if key in msg_lower:
-                    record.msg = self._sanitize_message(record.msg)
-                    break
+        """Filtra y sanitiza mensajes con datos sensibles.
+
+        Escanea el mensaje ya interpolado: con formateo perezoso (%s) el
+        secreto suele viajar en record.args, no en la plantilla. El filtro
+        corre en el handler, que iba a formatear el mensaje de todos modos.
+        """
+        if _SENSITIVE_RE.search(record.getMessage()):
+            record.msg = self._sanitize_message(record.msg)
+            record.args = None
         return True
 
     def _sanitize_message(self, message: str) -> str:
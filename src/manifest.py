@@ -0,0 +1,93 @@
+"""Manifiesto de archivos indexados para re-indexación incremental."""
+import hashlib
+import json
+import os
+from src.logger import get_logger
+
+logger = get_logger("rag.manifest")
+
+_HEAD_BYTES = 64 * 1024
+
+def _fingerprint(path: str) -> dict:
+    """Huella barata de un archivo: mtime_ns + tamaño + hash de los primeros 64 KiB."""
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        head = hashlib.sha256(f.read(_HEAD_BYTES)).hexdigest()
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "head_sha256": head}
+
+class IndexManifest:
+    """Mapa persistente path -> huella de lo ya indexado.
+
+    Permite que una re-indexación del mismo directorio se salte los archivos
+    sin cambios en lugar de volver a parsearlos y embeberlos.
+    """
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self._path = os.path.join(directory, "manifest.json")
+        self._entries: dict[str, dict] = {}
+        # Huellas en staging: solo pasan a _entries al confirmar con commit()
+        self._pending: dict[str, dict] = {}
+        if os.path.exists(self._path):
+            try:
+                with open(self._path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Manifiesto ilegible, se reconstruirá: %s", e)
+
+    def has_entries(self) -> bool:
+        """True si hay huellas confirmadas (hay índice previo que extender)."""
+        return bool(self._entries)
+
+    def is_known(self, path: str) -> bool:
+        """True si el archivo tiene huella confirmada (aunque haya cambiado)."""
+        return os.path.abspath(path) in self._entries
+
+    def is_unchanged(self, path: str) -> bool:
+        """True si el archivo ya fue indexado y su huella no cambió."""
+        entry = self._entries.get(os.path.abspath(path))
+        if entry is None:
+            return False
+        try:
+            return _fingerprint(path) == entry
+        except OSError:
+            return False
+
+    def update(self, path: str) -> None:
+        """Pone en staging la huella de un archivo cargado.
+
+        La huella no cuenta como indexada hasta commit(): si la indexación
+        falla antes de persistir, la siguiente ejecución vuelve a procesar
+        el archivo en vez de saltárselo.
+        """
+        try:
+            self._pending[os.path.abspath(path)] = _fingerprint(path)
+        except OSError as e:
+            logger.warning("No se pudo registrar %s: %s", path, e)
+
+    def commit(self) -> None:
+        """Confirma las huellas en staging; llamar solo tras persistir el índice."""
+        if not self._pending:
+            return
+        self._entries.update(self._pending)
+        self._pending.clear()
+        self.save()
+
+    def clear(self) -> None:
+        """Olvida todas las huellas (en memoria y en disco).
+
+        Debe acompañar al borrado del índice: sin esto, re-indexar en la
+        misma sesión filtraría todos los archivos como "sin cambios".
+        """
+        self._entries.clear()
+        self._pending.clear()
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
+
+    def save(self) -> None:
+        """Persiste el manifiesto a disco (recreando el directorio si hace falta)."""
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        with open(self._path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
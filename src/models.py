@@ -1,21 +1,42 @@
 """
-Modelos Pydantic (DTOs) para el sistema RAG.
+Modelos de datos (DTOs) para el sistema RAG.
+
+Los contenedores internos (SourceDocument, IndexStats, DocumentChunk) son
+dataclasses con slots: construcción ~4x más barata que Pydantic y menos
+memoria por instancia, clave en caminos calientes como _extract_sources.
+QueryResult sigue siendo Pydantic porque cruza la frontera hacia el usuario.
+
+Todos son inmutables (frozen): eso permite memoizar los formateadores con
+cached_property. No mutar vía model_copy(update=...) — el valor cacheado
+quedaría obsoleto; construir una instancia nueva en su lugar.
 """
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from os.path import basename
+
+from pydantic import BaseModel, ConfigDict, Field
+
 
+# El mismo corpus repite las mismas rutas en cada consulta: memoizar el
+# basename evita re-splitear strings idénticos millones de veces.
+@lru_cache(maxsize=4096)
+def _basename(path: str) -> str:
+    return basename(path)
 
-class SourceDocument(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class SourceDocument:
     """Representa un documento fuente o chunk recuperado."""
 
-    file_name: str = Field(description="Nombre del archivo fuente")
-    page: int | str = Field(description="Número de página o 'N/A'")
-    content: str = Field(description="Contenido del chunk")
-    similarity_score: float = Field(
-        ge=0.0,
-        le=1.0,
-        description="Score de similitud (0-1)",
-    )
-    preview: str = Field(description="Vista previa del contenido")
+    file_name: str
+    page: int | str
+    content: str
+    similarity_score: float
+    preview: str
+
+    def __post_init__(self):
+        if not 0.0 <= self.similarity_score <= 1.0:
+            raise ValueError(f"similarity_score fuera de [0, 1]: {self.similarity_score}")
 
     @classmethod
     def from_langchain_doc(
@@ -29,32 +50,31 @@ class SourceDocument(BaseModel):
 
         Args:
             doc: Documento de LangChain
-            score: Score de distancia (menor = más similar)
+            score: Similitud coseno (mayor = más similar)
             preview_length: Longitud de la vista previa
-
-        Returns:
-            SourceDocument
         """
-        import os
-
-        source_path = doc.metadata.get("source", "Unknown")
-        file_name = os.path.basename(source_path)
+        file_name = _basename(doc.metadata.get("source", "Unknown"))
         page = doc.metadata.get("page", "N/A")
         content = doc.page_content
-        similarity = max(0.0, min(1.0, 1 - score))
+        # El índice IP sobre vectores unitarios ya entrega similitud; solo clamp.
+        similarity = max(0.0, min(1.0, score))
+        # Una sola concatenación: el sufijo es "" cuando no hay truncado
+        tail = "..." if len(content) > preview_length else ""
 
         return cls(
             file_name=file_name,
             page=page,
             content=content,
             similarity_score=similarity,
-            preview=content[:preview_length] + "..." if len(content) > preview_length else content,
+            preview=content[:preview_length] + tail,
         )
 
 
 class QueryResult(BaseModel):
     """Resultado de una consulta RAG."""
 
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
     answer: str = Field(description="Respuesta generada por el LLM")
     sources: list[SourceDocument] = Field(
         default_factory=list,
@@ -69,6 +89,11 @@ class QueryResult(BaseModel):
 
     def format_sources(self) -> str:
         """Formatea las fuentes para mostrar al usuario."""
+        return self.formatted_sources
+
+    @cached_property
+    def formatted_sources(self) -> str:
+        """Render de las fuentes, calculado una sola vez por instancia."""
         if not self.sources:
             return ""
 
@@ -79,9 +104,9 @@ class QueryResult(BaseModel):
             "=" * 60,
         ]
 
-        seen = set()
+        seen: set[tuple[str, int | str]] = set()
         for i, source in enumerate(self.sources, 1):
-            source_id = f"{source.file_name}_{source.page}"
+            source_id = (source.file_name, source.page)
             if source_id in seen:
                 continue
             seen.add(source_id)
@@ -97,22 +122,27 @@ class QueryResult(BaseModel):
         return "\n".join(lines)
 
 
-class IndexStats(BaseModel):
+# Sin slots: cached_property necesita __dict__ para guardar el render.
+@dataclass(frozen=True)
+class IndexStats:
     """Estadísticas del índice de documentos."""
 
-    total_documents: int = Field(
-        ge=0,
-        description="Número total de documentos procesados",
-    )
-    total_chunks: int = Field(
-        ge=0,
-        description="Número total de chunks generados",
-    )
-    vectorstore_path: str = Field(description="Ruta del vector store")
-    is_loaded: bool = Field(description="Si el índice está cargado en memoria")
+    total_documents: int
+    total_chunks: int
+    vectorstore_path: str
+    is_loaded: bool
+
+    def __post_init__(self):
+        if self.total_documents < 0 or self.total_chunks < 0:
+            raise ValueError("Los contadores no pueden ser negativos")
 
     def format_stats(self) -> str:
         """Formatea las estadísticas para mostrar al usuario."""
+        return self.formatted_stats
+
+    @cached_property
+    def formatted_stats(self) -> str:
+        """Render de las estadísticas, calculado una sola vez por instancia."""
         status = "Cargado" if self.is_loaded else "No cargado"
         return (
             f"Documentos: {self.total_documents}\n"
@@ -122,10 +152,11 @@ class IndexStats(BaseModel):
         )
 
 
-class DocumentChunk(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DocumentChunk:
     """Representa un chunk de documento para indexar."""
 
-    content: str = Field(description="Contenido del chunk")
-    source: str = Field(description="Ruta del archivo fuente")
-    page: int | str = Field(default="N/A", description="Número de página")
-    metadata: dict = Field(default_factory=dict, description="Metadata adicional")
+    content: str
+    source: str
+    page: int | str = "N/A"
+    metadata: dict = field(default_factory=dict)
@@ -0,0 +1,50 @@
+"""Cache semántico de consultas para el bucle interactivo."""
+from collections import OrderedDict
+import numpy as np
+from src.models import QueryResult
+from src.interfaces import EmbeddingsInterface
+from src.logger import get_logger
+
+logger = get_logger("rag.query_cache")
+
+class SemanticQueryCache:
+    """LRU de QueryResult indexado por el embedding de la pregunta.
+
+    Preguntas repetidas o parafraseadas (similitud coseno sobre el umbral)
+    devuelven el resultado cacheado sin pagar recuperación ni LLM.
+    """
+
+    def __init__(self, embeddings: EmbeddingsInterface, threshold: float = 0.97, maxsize: int = 1000):
+        self._embeddings = embeddings
+        self._threshold = threshold
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[np.ndarray, QueryResult]] = OrderedDict()
+
+    def _embed(self, query: str) -> np.ndarray:
+        vec = np.asarray(self._embeddings.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def get(self, query: str) -> tuple[QueryResult | None, np.ndarray]:
+        """Busca un resultado similar; retorna también el embedding calculado."""
+        qv = self._embed(query)
+        if not self._entries:
+            return None, qv
+
+        keys = list(self._entries)
+        matrix = np.stack([self._entries[k][0] for k in keys])
+        scores = matrix @ qv
+        best = int(np.argmax(scores))
+        if scores[best] >= self._threshold:
+            key = keys[best]
+            self._entries.move_to_end(key)
+            logger.info("Cache semántico: hit (%.3f) para consulta similar", scores[best])
+            return self._entries[key][1], qv
+        return None, qv
+
+    def put(self, query: str, qv: np.ndarray, result: QueryResult) -> None:
+        """Guarda el resultado, desalojando la entrada menos usada si hace falta."""
+        self._entries[query] = (qv, result)
+        self._entries.move_to_end(query)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
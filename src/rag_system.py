@@ -1,11 +1,12 @@
 """Sistema RAG principal."""
-import os
-from langchain_ollama import ChatOllama
+import queue
+import threading
+from functools import lru_cache
+from typing import Iterator
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from src.config import Settings
-from src.models import QueryResult, SourceDocument
+from src.models import QueryResult, SourceDocument, _basename
 from src.exceptions import VectorStoreNotInitializedError, QueryError, IndexError as RAGIndexError
 from src.logger import get_logger
 from src.interfaces import VectorStoreInterface, DocumentLoaderInterface
@@ -17,6 +18,20 @@ Contexto: {context}
 Pregunta: {question}
 Si no sabes, dilo. Sé conciso y cita fuentes."""
 
+# Shim de import perezoso: langchain_ollama solo se paga si alguien pide el
+# LLM por defecto. Los tests pueden parchear src.rag_system.ChatOllama.
+ChatOllama = None
+
+@lru_cache(maxsize=4)
+def _get_llm(model: str, temperature: float, base_url: str):
+    """Cliente compartido por configuración: varios RAGSystem (tests,
+    multi-tenant) reutilizan la misma conexión en vez de abrir una cada uno."""
+    global ChatOllama
+    if ChatOllama is None:
+        from langchain_ollama import ChatOllama as _chat_ollama
+        ChatOllama = _chat_ollama
+    return ChatOllama(model=model, temperature=temperature, base_url=base_url)
+
 class RAGSystem:
     """Orquestador del flujo RAG."""
 
@@ -24,66 +39,227 @@ class RAGSystem:
         self._settings = settings
         self._vector_store = vector_store
         self._document_loader = document_loader
-        self._llm = llm or ChatOllama(
-            model=settings.llm_model_name,
-            temperature=settings.llm_temperature,
-            base_url=settings.ollama_base_url,
+        self._llm = llm or _get_llm(
+            settings.llm_model_name,
+            settings.llm_temperature,
+            settings.ollama_base_url,
         )
         self._prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
+        # La cadena LCEL se compone una sola vez; cada query solo la invoca.
+        self._chain = self._prompt | self._llm | StrOutputParser()
 
     @property
     def vector_store(self):
         return self._vector_store
 
     def index_documents(self, source_path: str) -> bool:
-        """Procesa, divide e indexa documentos."""
+        """Procesa, divide e indexa documentos por lotes.
+
+        Un hilo productor parsea y divide mientras este hilo embebe e inserta:
+        el encoder no espera al disco ni viceversa. La cola acotada da
+        backpressure y mantiene la memoria constante.
+        """
         try:
             logger.info("Iniciando indexación...")
-            chunks = self._document_loader.process_documents(source_path)
-            if not chunks: return False
-            self._vector_store.create_vectorstore(chunks)
-            logger.info("Indexación completada")
+            manifest = getattr(self._document_loader, "manifest", None)
+            if manifest is not None and manifest.has_entries():
+                # Una pasada incremental anexa sobre el índice en disco; si
+                # éste no existe, el manifiesto está huérfano y filtrar
+                # archivos persistiría un índice parcial: limpiarlo fuerza
+                # la reconstrucción completa.
+                if not self._vector_store.is_initialized() and not self._vector_store.load_vectorstore():
+                    manifest.clear()
+
+            batches: queue.Queue = queue.Queue(maxsize=4)
+            stop = threading.Event()
+            producer_error: list[Exception] = []
+
+            def _put(item) -> bool:
+                """Encola con timeout corto; False si el consumidor pidió parar."""
+                while not stop.is_set():
+                    try:
+                        batches.put(item, timeout=0.2)
+                        return True
+                    except queue.Full:
+                        pass
+                return False
+
+            def _produce():
+                try:
+                    for batch in self._document_loader.iter_chunks(source_path):
+                        if not _put(batch):
+                            return
+                except Exception as e:
+                    producer_error.append(e)
+                finally:
+                    _put(None)
+
+            producer = threading.Thread(target=_produce, daemon=True)
+            producer.start()
+
+            total = 0
+            try:
+                while (batch := batches.get()) is not None:
+                    if total == 0:
+                        self._prepare_index_target(manifest)
+                    self._vector_store.add_documents(batch)
+                    total += len(batch)
+            finally:
+                # Si add_documents falló a mitad de la ingesta, el productor
+                # puede estar bloqueado en put: señalar parada y vaciar la
+                # cola para que termine en vez de quedar vivo toda la sesión.
+                stop.set()
+                while True:
+                    try:
+                        batches.get_nowait()
+                    except queue.Empty:
+                        break
+                producer.join()
+            if producer_error:
+                raise producer_error[0]
+
+            if not total:
+                if manifest is not None and manifest.has_entries():
+                    # Todo estaba ya indexado: es éxito, no un fallo. El
+                    # bloque de arriba ya dejó el índice cargado y consultable.
+                    logger.info("Índice al día: nada que reindexar")
+                    return True
+                return False
+            # Una sola escritura a disco al final, no un save por lote
+            self._vector_store.persist()
+            # Las huellas del manifiesto solo se confirman con el índice ya
+            # persistido; un fallo previo no deja archivos marcados como indexados.
+            if manifest is not None:
+                manifest.commit()
+            logger.info("Indexación completada (%d chunks)", total)
             return True
         except Exception as e:
             raise RAGIndexError("Falló la indexación", str(e)) from e
 
+    def _prepare_index_target(self, manifest) -> None:
+        """Decide entre anexar al índice existente o reconstruir desde cero.
+
+        Se llama con el primer lote ya producido: para entonces el loader
+        terminó de escanear y el manifiesto refleja la pasada real. Solo una
+        pasada incremental (únicamente archivos nuevos) conserva el índice
+        cargado; cualquier otra reconstruye — indexar tras cargar no debe
+        duplicar el corpus, y HNSW no puede borrar chunks obsoletos.
+        """
+        if manifest is not None and manifest.has_entries():
+            return
+        self._vector_store.reset()
+
     def load_existing_index(self) -> bool:
         """Carga el índice del disco."""
         return self._vector_store.load_vectorstore()
 
     def query(self, question: str, k: int | None = None) -> QueryResult:
-        """Consulta el sistema RAG."""
+        """Consulta el sistema RAG.
+
+        Para evaluación o cargas con muchas preguntas, query_batch amortiza
+        la búsqueda FAISS y las llamadas al LLM en una sola pasada.
+        """
         if not self._vector_store.is_initialized():
             raise VectorStoreNotInitializedError()
+        # Camino rápido: con k=0 o índice vacío la recuperación sería vacía;
+        # evita pagar embedding + FAISS + LLM en llamadas degeneradas.
+        if k == 0 or self._vector_store.size() == 0:
+            return QueryResult.model_construct(answer="", sources=[], query=question)
 
         try:
             logger.info("Buscando contexto...")
-            docs_scores = self._vector_store.similarity_search(question, k=k or self._settings.retrieval_k)
-            docs = [d for d, _ in docs_scores]
-            
-            chain = (
-                {"context": lambda _: self._format(docs), "question": RunnablePassthrough()}
-                | self._prompt | self._llm | StrOutputParser()
-            )
-            
+            docs_scores = self._retrieve(question, k)
+            # Un solo desempaquetado en vez de dos list comprehensions
+            docs, scores = zip(*docs_scores) if docs_scores else ((), ())
+
             logger.info("Generando respuesta...")
-            return QueryResult(
-                answer=chain.invoke(question),
-                sources=self._extract_sources(docs, [s for _, s in docs_scores]),
+            # Construcción sin validación: todos los campos vienen de código propio
+            return QueryResult.model_construct(
+                answer=self._chain.invoke({"context": self._format_context(docs), "question": question}),
+                sources=self._extract_sources(docs, scores),
                 query=question
             )
         except VectorStoreNotInitializedError: raise
         except Exception as e:
             raise QueryError("Falló la consulta", str(e)) from e
 
-    def _format(self, docs) -> str:
-        return "\n".join([f"[Doc {i+1}]: {d.page_content}" for i, d in enumerate(docs)])
+    def _retrieve(self, question: str, k: int | None) -> list:
+        """Recupera (documento, score) para una pregunta."""
+        return self._vector_store.similarity_search(question, k=k or self._settings.retrieval_k)
+
+    def query_stream(self, question: str, k: int | None = None) -> Iterator[str]:
+        """Consulta en streaming: entrega tokens según llegan del LLM.
+
+        La recuperación se hace de forma eager (los errores saltan aquí, no
+        en el primer next()); solo la generación se difiere. Mismo trabajo
+        total que query(), pero el primer token llega mucho antes.
+        """
+        if not self._vector_store.is_initialized():
+            raise VectorStoreNotInitializedError()
+
+        try:
+            docs = [d for d, _ in self._retrieve(question, k)]
+            payload = {"context": self._format_context(docs), "question": question}
+        except Exception as e:
+            raise QueryError("Falló la consulta", str(e)) from e
+
+        return (token for token in self._chain.stream(payload))
+
+    def query_batch(self, questions: list[str], k: int | None = None) -> list[QueryResult]:
+        """Responde varias preguntas en lote.
+
+        Una sola búsqueda FAISS multi-consulta y un solo chain.batch: el
+        cliente LLM pipelinea las peticiones en vez de serializarlas.
+        """
+        if not self._vector_store.is_initialized():
+            raise VectorStoreNotInitializedError()
+        if not questions:
+            return []
+
+        try:
+            per_query = self._vector_store.similarity_search_batch(
+                questions, k=k or self._settings.retrieval_k
+            )
+            unpacked = [tuple(zip(*results)) or ((), ()) for results in per_query]
+            payloads = [
+                {"context": self._format_context(docs), "question": q}
+                for q, (docs, _) in zip(questions, unpacked)
+            ]
+            answers = self._chain.batch(payloads)
+            return [
+                QueryResult.model_construct(
+                    answer=answer,
+                    sources=self._extract_sources(docs, scores),
+                    query=q,
+                )
+                for q, (docs, scores), answer in zip(questions, unpacked, answers)
+            ]
+        except Exception as e:
+            raise QueryError("Falló la consulta en lote", str(e)) from e
+
+    def _format_context(self, docs) -> str:
+        """Formatea el contexto en un solo join, sin lista intermedia.
+
+        Cabecera compacta por documento: menos tokens de plantilla hacia el
+        LLM y O(N) en asignación de strings.
+        """
+        return "\n\n".join(
+            f"[Documento {i}] (fuente: {_basename(d.metadata.get('source', ''))}, "
+            f"página {d.metadata.get('page', 'N/A')})\n{d.page_content}"
+            for i, d in enumerate(docs, 1)
+        )
 
     def _extract_sources(self, docs, scores) -> list[SourceDocument]:
-        """Extrae metadatos únicos de las fuentes."""
-        seen, sources = set(), []
+        """Extrae metadatos únicos de las fuentes.
+
+        Una sola pasada con un set de claves (source, page): O(k) incluso
+        con fan-outs de recuperación grandes.
+        """
+        # Claves tupla: hashear (source, page) es más barato que formatear un string
+        seen: set[tuple[str, int | str]] = set()
+        sources = []
         for doc, score in zip(docs, scores):
-            sid = f"{doc.metadata.get('source')}_{doc.metadata.get('page')}"
+            sid = (doc.metadata.get("source"), doc.metadata.get("page"))
             if sid not in seen:
                 seen.add(sid)
                 sources.append(SourceDocument.from_langchain_doc(doc, score))
@@ -91,3 +267,8 @@ class RAGSystem:
 
     def delete_index(self) -> None:
         self._vector_store.delete_vectorstore()
+        # El manifiesto acompaña al índice: sin esto, re-indexar en la misma
+        # sesión saltaría todos los archivos como "sin cambios".
+        manifest = getattr(self._document_loader, "manifest", None)
+        if manifest is not None:
+            manifest.clear()
@@ -1,69 +1,227 @@
-"""Gestión de ChromaDB."""
+"""Gestión del índice vectorial FAISS."""
 import os
 import shutil
+from functools import lru_cache
+import faiss
+import numpy as np
 from langchain_core.documents import Document
-from langchain_community.vectorstores import Chroma
-from src.embeddings import LocalEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from src.embeddings import get_embeddings
 from src.exceptions import VectorStoreError, VectorStoreNotInitializedError, VectorStoreEmptyError
 from src.logger import get_logger
 from src.interfaces import EmbeddingsInterface
 
 logger = get_logger("rag.vector_store")
 
+# Parámetros HNSW: M controla el grado del grafo; ef la calidad de búsqueda.
+_HNSW_M = 32
+_EF_CONSTRUCTION = 200
+_EF_SEARCH = 64
+
 class VectorStore:
-    """Manejo de base de datos vectorial ChromaDB."""
+    """Manejo del índice vectorial FAISS (HNSW).
+
+    Las consultas recorren el grafo HNSW en O(log N) con kernels SIMD de
+    FAISS, en lugar del escaneo respaldado por SQLite de Chroma.
+    """
 
-    def __init__(self, persist_directory: str = "./vectorstore", embeddings: EmbeddingsInterface | None = None):
+    def __init__(
+        self,
+        persist_directory: str = "./vectorstore",
+        embeddings: EmbeddingsInterface | None = None,
+        quantization: str = "none",
+        ingest_batch_size: int = 256,
+        query_cache_size: int = 1024,
+    ):
         self.persist_directory = persist_directory
         self._embeddings = embeddings
-        self._vectorstore: Chroma | None = None
+        self._ingest_batch_size = ingest_batch_size
+        # "sq8" cuantiza los vectores almacenados a int8 (4x menos memoria,
+        # pérdida de recall <1% en encoders pequeños)
+        self._quantization = quantization
+        self._vectorstore: FAISS | None = None
+        # Cache LRU por instancia: preguntas repetidas no vuelven a pagar
+        # embedding + recorrido ANN. Se invalida al mutar el índice.
+        self._search_ids = lru_cache(maxsize=query_cache_size)(self._search_ids_uncached)
 
     @property
     def embeddings(self) -> EmbeddingsInterface:
         if self._embeddings is None:
-            self._embeddings = LocalEmbeddings()
+            # Factoría cacheada: varios stores comparten los mismos pesos
+            self._embeddings = get_embeddings()
         return self._embeddings
 
     def is_initialized(self) -> bool:
         return self._vectorstore is not None
 
+    def size(self) -> int:
+        """Número de vectores en el índice (0 si no está inicializado)."""
+        return self._vectorstore.index.ntotal if self._vectorstore else 0
+
+    def reset(self) -> None:
+        """Descarta el índice en memoria; el disco no se toca hasta persist()."""
+        self._vectorstore = None
+        self._invalidate_caches()
+
+    def _embed_texts(self, texts: list[str]) -> np.ndarray:
+        """Embeddings como float32 (n, d) unitarios, por la ruta ndarray si existe."""
+        if hasattr(self.embeddings, "embed_documents_np"):
+            vecs = np.ascontiguousarray(self.embeddings.embed_documents_np(texts))
+        else:
+            vecs = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        # Con vectores unitarios el producto interno ES la similitud coseno.
+        faiss.normalize_L2(vecs)
+        return vecs
+
+    def _new_faiss(self, dim: int, train_vecs: np.ndarray | None = None) -> FAISS:
+        """Construye el wrapper FAISS sobre un índice HNSW vacío."""
+        if self._quantization == "sq8":
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            if train_vecs is not None:
+                # El scalar quantizer calibra sus rangos con el primer lote.
+                index.train(train_vecs)
+        else:
+            index = faiss.IndexHNSWFlat(dim, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = _EF_CONSTRUCTION
+        index.hnsw.efSearch = _EF_SEARCH
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={},
+        )
+
+    def _persist_batch(self, batch: list[Document]) -> None:
+        """Embebe e inserta un lote acotado; crea el índice con el primero."""
+        texts = [d.page_content for d in batch]
+        vecs = self._embed_texts(texts)
+        if self._vectorstore is None:
+            self._vectorstore = self._new_faiss(vecs.shape[1], train_vecs=vecs)
+        self._vectorstore.add_embeddings(
+            zip(texts, vecs), metadatas=[d.metadata for d in batch]
+        )
+
     def create_vectorstore(self, documents: list[Document]) -> None:
-        """Crea y persiste la base de datos vectorial desde documentos."""
+        """Crea y persiste el índice vectorial desde documentos.
+
+        Embebe e inserta en lotes de ingest_batch_size: nunca hay más de un
+        lote de tensores vivo en RAM y el encoder trabaja con batches llenos.
+        """
         if not documents:
             raise VectorStoreEmptyError()
 
         try:
-            logger.info(f"Creando DB vectorial con {len(documents)} chunks...")
-            self._vectorstore = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                persist_directory=self.persist_directory,
-            )
-            logger.info(f"Guardado en: {self.persist_directory}")
+            logger.info("Creando índice vectorial con %d chunks...", len(documents))
+            self._vectorstore = None
+            for i in range(0, len(documents), self._ingest_batch_size):
+                self._persist_batch(documents[i:i + self._ingest_batch_size])
+            self._vectorstore.save_local(self.persist_directory)
+            self._invalidate_caches()
+            logger.info("Guardado en: %s", self.persist_directory)
         except Exception as e:
             raise VectorStoreError("Error creando vector store", str(e)) from e
 
+    def add_documents(self, documents: list[Document]) -> None:
+        """Añade un lote de documentos, creando el índice si aún no existe.
+
+        Lotes de ~1k amortizan las actualizaciones de vecinos del grafo HNSW.
+        No escribe a disco: el llamador debe invocar persist() al terminar la
+        ingesta, para pagar una sola serialización en vez de una por lote.
+        """
+        if not documents:
+            return
+        try:
+            self._persist_batch(documents)
+            self._invalidate_caches()
+        except Exception as e:
+            raise VectorStoreError("Error añadiendo documentos", str(e)) from e
+
+    def persist(self) -> None:
+        """Serializa el índice a disco una sola vez, al final de la ingesta."""
+        if not self.is_initialized():
+            raise VectorStoreNotInitializedError()
+        try:
+            self._vectorstore.save_local(self.persist_directory)
+            logger.info("Guardado en: %s", self.persist_directory)
+        except Exception as e:
+            raise VectorStoreError("Error persistiendo vector store", str(e)) from e
+
     def load_vectorstore(self) -> bool:
-        """Carga la base de datos existente."""
-        if not os.path.exists(self.persist_directory):
-            logger.warning(f"No existe DB en: {self.persist_directory}")
+        """Carga el índice existente desde disco."""
+        if not os.path.exists(os.path.join(self.persist_directory, "index.faiss")):
+            logger.warning("No existe índice en: %s", self.persist_directory)
             return False
 
         try:
-            logger.info("Cargando DB vectorial...")
-            self._vectorstore = Chroma(
-                persist_directory=self.persist_directory,
-                embedding_function=self.embeddings,
+            logger.info("Cargando índice vectorial...")
+            self._vectorstore = FAISS.load_local(
+                self.persist_directory,
+                self.embeddings,
+                allow_dangerous_deserialization=True,
             )
+            if hasattr(self._vectorstore.index, "hnsw"):
+                self._vectorstore.index.hnsw.efSearch = _EF_SEARCH
+            self._invalidate_caches()
             return True
         except Exception as e:
             raise VectorStoreError("Error cargando vector store", str(e)) from e
 
+    def _invalidate_caches(self) -> None:
+        """Vacía el cache de búsquedas tras mutar el índice.
+
+        Los documentos se leen directamente del dict del docstore (que
+        LangChain ya mantiene al día), así que invalidar es O(1) por lote
+        en vez de copiar un mapa que crece con cada inserción.
+        """
+        self._search_ids.cache_clear()
+
+    def _search_ids_uncached(self, query_norm: str, k: int) -> tuple[tuple[str, float], ...]:
+        """Busca en el índice y retorna pares (id, score) hasheables."""
+        if hasattr(self.embeddings, "embed_query_np"):
+            vec = np.ascontiguousarray(self.embeddings.embed_query_np(query_norm))
+        else:
+            vec = np.asarray(self.embeddings.embed_query(query_norm), dtype=np.float32)
+        vec = vec[None, :]
+        faiss.normalize_L2(vec)
+        scores, idxs = self._vectorstore.index.search(vec, k)
+        return tuple(
+            (self._vectorstore.index_to_docstore_id[int(i)], float(s))
+            for s, i in zip(scores[0], idxs[0])
+            if i != -1
+        )
+
     def similarity_search(self, query: str, k: int = 4) -> list[tuple[Document, float]]:
-        """Busca documentos similares a la consulta."""
+        """Busca documentos similares; el score es similitud coseno (mayor = mejor)."""
+        if not self.is_initialized():
+            raise VectorStoreNotInitializedError()
+        # Normalizar espacios/mayúsculas colapsa variantes triviales de la
+        # misma pregunta en una sola entrada de cache.
+        query_norm = " ".join(query.lower().split())
+        docs = self._vectorstore.docstore._dict
+        return [(docs[did], score) for did, score in self._search_ids(query_norm, k)]
+
+    def similarity_search_batch(self, queries: list[str], k: int = 4) -> list[list[tuple[Document, float]]]:
+        """Resuelve varias consultas en una sola llamada a FAISS.
+
+        Embeber el lote completo y buscar con una matriz (n, d) usa los
+        kernels vectorizados de FAISS en vez de n recorridos independientes.
+        """
         if not self.is_initialized():
             raise VectorStoreNotInitializedError()
-        return self._vectorstore.similarity_search_with_score(query, k=k)
+        if not queries:
+            return []
+        qvecs = self._embed_texts(queries)
+        scores, idxs = self._vectorstore.index.search(qvecs, k)
+        docs = self._vectorstore.docstore._dict
+        return [
+            [
+                (docs[self._vectorstore.index_to_docstore_id[int(i)]], float(s))
+                for s, i in zip(row_scores, row_idxs)
+                if i != -1
+            ]
+            for row_scores, row_idxs in zip(scores, idxs)
+        ]
 
     def get_retriever(self, k: int = 4):
         """Retorna un objeto retriever de LangChain."""
@@ -77,3 +235,4 @@ class VectorStore:
             shutil.rmtree(self.persist_directory)
             logger.info("Base de datos eliminada")
         self._vectorstore = None
+        self._invalidate_caches()
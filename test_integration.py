@@ -1,4 +1,5 @@
 """Script de prueba de integracion del sistema RAG."""
+import logging
 import os
 import sys
 
@@ -6,24 +7,53 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.config import get_settings
-from src.document_loader import DocumentLoader
+from src.document_loader import DocumentLoader, _iter_supported_files
 from src.vector_store import VectorStore
 from src.rag_system import RAGSystem
 
+# Logging perezoso (%s) en vez de prints: sin flushes por línea y las
+# cadenas solo se formatean si el nivel está activo.
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger("rag-integration")
+
+CORPUS_DIR = "./data/documentos"
+STAMP_PATH = "./test_vectorstore_temp/.mtime"
+
+
+def _banner(title: str) -> None:
+    log.info("\n%s\n%s\n%s", "=" * 60, title, "=" * 60)
+
+
+def _corpus_mtime(corpus_dir: str) -> float:
+    """mtime más reciente del corpus (0 si está vacío)."""
+    return max((os.path.getmtime(p) for p in _iter_supported_files(corpus_dir)), default=0.0)
+
+
+def _corpus_changed(corpus_dir: str, stamp_path: str) -> bool:
+    """True si algún archivo del corpus es más nuevo que el sello guardado."""
+    try:
+        with open(stamp_path) as f:
+            stamp = float(f.read())
+    except (OSError, ValueError):
+        return True
+    return _corpus_mtime(corpus_dir) > stamp
+
+
+def _write_mtime(corpus_dir: str, stamp_path: str) -> None:
+    with open(stamp_path, "w") as f:
+        f.write(str(_corpus_mtime(corpus_dir)))
+
+
 def main():
-    print("=" * 60)
-    print("TEST DE INTEGRACION DEL SISTEMA RAG")
-    print("=" * 60)
+    _banner("TEST DE INTEGRACION DEL SISTEMA RAG")
 
     # 1. Cargar configuracion
-    print("\n[1/4] Cargando configuracion...")
+    log.info("\n[1/4] Cargando configuracion...")
     settings = get_settings()
-    print(f"  - Modelo: {settings.llm_model_name}")
-    print(f"  - Chunk size: {settings.chunk_size}")
-    print("  OK!")
+    log.info("  - Modelo: %s\n  - Chunk size: %s\n  OK!", settings.llm_model_name, settings.chunk_size)
 
     # 2. Crear componentes
-    print("\n[2/4] Creando componentes del sistema...")
+    log.info("\n[2/4] Creando componentes del sistema...")
     document_loader = DocumentLoader(
         chunk_size=settings.chunk_size,
         chunk_overlap=settings.chunk_overlap,
@@ -38,42 +68,39 @@ def main():
         vector_store=vector_store,
         document_loader=document_loader,
     )
-    print("  OK!")
+    log.info("  OK!")
 
-    # 3. Indexar documento de prueba
-    print("\n[3/4] Indexando documentos de prueba...")
-    success = rag_system.index_documents("./data/documentos")
-    if success:
-        print("  OK!")
+    # 3. Indexar documento de prueba (o reutilizar el índice existente)
+    log.info("\n[3/4] Indexando documentos de prueba...")
+    # El índice solo se carga en la rama de reutilización: en la de rebuild
+    # el store parte descargado y el índice nuevo no anexa sobre el viejo.
+    if not _corpus_changed(CORPUS_DIR, STAMP_PATH) and rag_system.load_existing_index():
+        log.info("  Reutilizando indice existente (corpus sin cambios)")
     else:
-        print("  ERROR: No se pudieron indexar los documentos")
-        return
+        success = rag_system.index_documents(CORPUS_DIR)
+        if not success:
+            log.error("  ERROR: No se pudieron indexar los documentos")
+            return
+        _write_mtime(CORPUS_DIR, STAMP_PATH)
+        log.info("  OK!")
 
     # 4. Hacer una consulta
-    print("\n[4/4] Realizando consulta de prueba...")
+    log.info("\n[4/4] Realizando consulta de prueba...")
     question = "Que es el sistema RAG y cuales son sus componentes?"
-    print(f"  Pregunta: {question}")
+    log.info("  Pregunta: %s", question)
 
     result = rag_system.query(question)
 
-    print("\n" + "=" * 60)
-    print("RESPUESTA:")
-    print("=" * 60)
-    print(result.answer)
+    _banner("RESPUESTA:")
+    log.info("%s", result.answer)
 
-    print("\n" + "=" * 60)
-    print("FUENTES:")
-    print("=" * 60)
-    print(result.format_sources())
+    _banner("FUENTES:")
+    log.info("%s", result.format_sources())
 
-    # Limpiar
-    print("\n[OK] Limpiando recursos de prueba...")
-    rag_system.delete_index()
-    print("  OK!")
+    # El índice se conserva: la siguiente ejecución lo reutiliza si el
+    # corpus no cambió (borrar ./test_vectorstore_temp para forzar rebuild).
 
-    print("\n" + "=" * 60)
-    print("TEST COMPLETADO EXITOSAMENTE!")
-    print("=" * 60)
+    _banner("TEST COMPLETADO EXITOSAMENTE!")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,54 @@
+"""
+Stubs ligeros para tests que solo necesitan comportamiento.
+
+Un atributo real se resuelve en ~ns frente a la maquinaria de child-mocks y
+call-tracking de MagicMock; usar estos stubs donde no se hacen
+assert_called_* mantiene el setup de la suite barato.
+"""
+from dataclasses import dataclass, field
+
+from langchain_core.documents import Document
+
+
+@dataclass
+class StubVectorStore:
+    """VectorStore de comportamiento fijo, sin tracking de llamadas."""
+
+    initialized: bool = True
+    docs: list[Document] = field(default_factory=list)
+    deleted: bool = False
+    persisted: bool = False
+
+    def is_initialized(self) -> bool:
+        return self.initialized
+
+    def size(self) -> int:
+        return len(self.docs) if self.initialized else 0
+
+    def create_vectorstore(self, documents: list[Document]) -> None:
+        self.docs = list(documents)
+        self.initialized = True
+
+    def add_documents(self, documents: list[Document]) -> None:
+        self.docs.extend(documents)
+        self.initialized = True
+
+    def persist(self) -> None:
+        self.persisted = True
+
+    def reset(self) -> None:
+        self.docs = []
+        self.initialized = False
+
+    def load_vectorstore(self) -> bool:
+        return self.initialized
+
+    def similarity_search(self, query: str, k: int = 4) -> list[tuple[Document, float]]:
+        return [(doc, 1.0) for doc in self.docs[:k]]
+
+    def similarity_search_batch(self, queries: list[str], k: int = 4):
+        return [self.similarity_search(q, k) for q in queries]
+
+    def delete_vectorstore(self) -> None:
+        self.deleted = True
+        self.initialized = False
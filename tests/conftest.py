@@ -5,15 +5,26 @@ import os
 import sys
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 from langchain_core.documents import Document
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Un solo array contiguo compartido por todos los tests, en vez de listas de
+# floats de Python reconstruidas por fixture. Mismo dtype que el encoder real.
+_FAKE_EMB = np.full((3, 384), 0.1, dtype=np.float32)
+_FAKE_QUERY = _FAKE_EMB[0]
 
-@pytest.fixture
+
+# Los fixtures inmutables (settings, documentos de ejemplo) son de sesión:
+# se construyen una vez en lugar de una vez por test. Los MagicMock siguen
+# siendo por función porque los tests mutan return_value y cuentan llamadas.
+
+
+@pytest.fixture(scope="session")
 def mock_settings():
-    """Settings mockeado para tests."""
+    """Settings mockeado para tests (inmutable, compartido por la sesión)."""
     from src.config import Settings
     from unittest.mock import patch
 
@@ -30,9 +41,9 @@ def mock_settings():
         yield settings
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_documents():
-    """Documentos de ejemplo para tests."""
+    """Documentos de ejemplo para tests (solo lectura)."""
     return [
         Document(
             page_content="Este es el contenido del primer documento sobre Python.",
@@ -54,17 +65,29 @@ def mock_vector_store():
     """VectorStore mockeado."""
     mock = MagicMock()
     mock.is_initialized.return_value = True
+    mock.size.return_value = 3
     mock.create_vectorstore.return_value = None
     mock.load_vectorstore.return_value = True
     mock.delete_vectorstore.return_value = None
     return mock
 
 
+@pytest.fixture
+def stub_vector_store():
+    """Stub de VectorStore para tests que no verifican llamadas."""
+    from tests._stubs import StubVectorStore
+
+    return StubVectorStore()
+
+
 @pytest.fixture
 def mock_document_loader(sample_documents):
     """DocumentLoader mockeado."""
     mock = MagicMock()
+    # Sin manifiesto: los tests unitarios ejercitan la pasada no incremental
+    mock.manifest = None
     mock.process_documents.return_value = sample_documents
+    mock.iter_chunks.return_value = [sample_documents]
     mock.load_document.return_value = sample_documents[:1]
     mock.load_directory.return_value = sample_documents
     mock.split_documents.return_value = sample_documents
@@ -79,10 +102,60 @@ def mock_llm():
     return mock
 
 
+@pytest.fixture(scope="session")
+def shared_embeddings():
+    """Embeddings reales compartidos por toda la sesión.
+
+    Solo se carga al primer uso (los fixtures son perezosos): las suites
+    unitarias con mocks nunca pagan los pesos del modelo. Va por
+    get_embeddings, así que comparte instancia con el resto del proceso.
+    """
+    from src.embeddings import get_embeddings
+
+    return get_embeddings()
+
+
+@pytest.fixture(scope="session")
+def persistent_vectorstore(tmp_path_factory, shared_embeddings):
+    """VectorStore de sesión sobre el corpus de ejemplo.
+
+    Con RAG_TEST_VS_CACHE apuntando a un directorio, el índice FAISS se
+    reutiliza entre ejecuciones: solo el primer run paga embed + build. Se
+    reconstruye si algún archivo del corpus es más nuevo que index.faiss,
+    para que el cache nunca sirva un índice desactualizado.
+    """
+    from src.document_loader import DocumentLoader, _iter_supported_files
+    from src.vector_store import VectorStore
+
+    data_dir = "./data/documentos"
+    if not os.path.isdir(data_dir):
+        pytest.skip(f"No existe el corpus de ejemplo: {data_dir}")
+
+    cache_dir = os.environ.get("RAG_TEST_VS_CACHE") or str(tmp_path_factory.mktemp("vs_cache"))
+    index_path = os.path.join(cache_dir, "index.faiss")
+    corpus_mtime = max(
+        (os.path.getmtime(p) for p in _iter_supported_files(data_dir)), default=0.0
+    )
+    stale = not os.path.exists(index_path) or corpus_mtime > os.path.getmtime(index_path)
+
+    vs = VectorStore(cache_dir, shared_embeddings)
+    if stale or not vs.load_vectorstore():
+        docs = DocumentLoader().process_documents(data_dir)
+        vs.create_vectorstore(docs)
+    return vs
+
+
 @pytest.fixture
 def mock_embeddings():
-    """Embeddings mockeados."""
+    """Embeddings mockeados (respaldados por float32, como el encoder real)."""
     mock = MagicMock()
-    mock.embed_documents.return_value = [[0.1] * 384 for _ in range(3)]
-    mock.embed_query.return_value = [0.1] * 384
+    # side_effect dimensiona según la entrada, sin asignar filas de sobra
+    mock.embed_documents.side_effect = lambda texts: np.full(
+        (len(texts), 384), 0.1, dtype=np.float32
+    ).tolist()
+    mock.embed_documents_np.side_effect = lambda texts: np.full(
+        (len(texts), 384), 0.1, dtype=np.float32
+    )
+    mock.embed_query.return_value = _FAKE_QUERY.tolist()
+    mock.embed_query_np.return_value = _FAKE_QUERY
     return mock
@@ -7,106 +7,77 @@ from unittest.mock import patch
 import pytest
 from pydantic import ValidationError
 
-from src.config import Settings, get_settings
+from src.config import Settings, get_settings, reset_settings
 from src.exceptions import ConfigurationError
 
 
 class TestSettings:
     """Tests para la clase Settings."""
 
-    def test_settings_with_valid_api_key(self):
-        """Test que Settings se crea correctamente con API key válida."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-valid-test-key"}):
-            settings = Settings()
-            assert settings.openai_api_key == "sk-valid-test-key"
-
     def test_settings_default_values(self):
         """Test que los valores por defecto son correctos."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-valid-test-key"}):
-            settings = Settings()
-            assert settings.llm_model_name == "gpt-3.5-turbo"
-            assert settings.llm_temperature == 0.7
-            assert settings.embedding_model_name == "all-MiniLM-L6-v2"
-            assert settings.vectorstore_path == "./vectorstore"
-            assert settings.chunk_size == 1000
-            assert settings.chunk_overlap == 200
-            assert settings.retrieval_k == 4
+        settings = Settings(_env_file=None)
+        assert settings.ollama_base_url == "http://localhost:11434"
+        assert settings.llm_model_name == "qwen2.5:7b"
+        assert settings.llm_temperature == 0.1
+        assert settings.embedding_model_name == "intfloat/multilingual-e5-small"
+        assert settings.vectorstore_path == "./vectorstore"
+        assert settings.chunk_size == 1000
+        assert settings.chunk_overlap == 200
+        assert settings.retrieval_k == 4
 
     def test_settings_custom_values(self):
         """Test que se pueden configurar valores personalizados."""
         env_vars = {
-            "OPENAI_API_KEY": "sk-custom-key",
-            "LLM_MODEL_NAME": "gpt-4",
+            "LLM_MODEL_NAME": "llama3.2:3b",
             "LLM_TEMPERATURE": "0.5",
             "CHUNK_SIZE": "500",
             "RETRIEVAL_K": "6",
         }
         with patch.dict(os.environ, env_vars):
             settings = Settings()
-            assert settings.llm_model_name == "gpt-4"
+            assert settings.llm_model_name == "llama3.2:3b"
             assert settings.llm_temperature == 0.5
             assert settings.chunk_size == 500
             assert settings.retrieval_k == 6
 
-    def test_settings_fails_without_api_key(self, monkeypatch):
-        """Test que falla sin API key."""
-        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-        with pytest.raises(ValidationError):
+    # Un solo test parametrizado para todos los "env inválido → ValidationError":
+    # menos ciclos de setup/teardown y diagnósticos por id en vez de por nombre.
+    @pytest.mark.parametrize(
+        "env,expected_field",
+        [
+            pytest.param({"LLM_TEMPERATURE": "-0.5"}, "llm_temperature", id="temp_min"),
+            pytest.param({"LLM_TEMPERATURE": "2.5"}, "llm_temperature", id="temp_max"),
+            pytest.param({"CHUNK_SIZE": "0"}, "chunk_size", id="chunk_zero"),
+            pytest.param({"RETRIEVAL_K": "0"}, "retrieval_k", id="k_zero"),
+            pytest.param({"INDEX_QUANTIZATION": "pq"}, "index_quantization", id="bad_quant"),
+        ],
+    )
+    def test_settings_rejects_invalid_env(self, env, expected_field, monkeypatch):
+        """Test que los valores fuera de rango lanzan ValidationError."""
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        with pytest.raises(ValidationError) as exc_info:
             Settings(_env_file=None)
-
-    def test_settings_fails_with_placeholder_api_key(self):
-        """Test que falla con API key placeholder."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "tu_api_key_aqui"}):
-            with pytest.raises(ValidationError):
-                Settings()
-
-    def test_settings_fails_with_invalid_api_key(self):
-        """Test que falla con API key inválida."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-xxx-invalid"}):
-            with pytest.raises(ValidationError):
-                Settings()
-
-    def test_temperature_validation_min(self):
-        """Test que temperature debe ser >= 0."""
-        with patch.dict(os.environ, {
-            "OPENAI_API_KEY": "sk-valid-key",
-            "LLM_TEMPERATURE": "-0.5",
-        }):
-            with pytest.raises(ValidationError):
-                Settings()
-
-    def test_temperature_validation_max(self):
-        """Test que temperature debe ser <= 2."""
-        with patch.dict(os.environ, {
-            "OPENAI_API_KEY": "sk-valid-key",
-            "LLM_TEMPERATURE": "2.5",
-        }):
-            with pytest.raises(ValidationError):
-                Settings()
-
-    def test_chunk_size_must_be_positive(self):
-        """Test que chunk_size debe ser positivo."""
-        with patch.dict(os.environ, {
-            "OPENAI_API_KEY": "sk-valid-key",
-            "CHUNK_SIZE": "0",
-        }):
-            with pytest.raises(ValidationError):
-                Settings()
+        assert expected_field in str(exc_info.value)
 
 
 class TestGetSettings:
     """Tests para la función get_settings."""
 
     def test_get_settings_returns_settings(self):
-        """Test que get_settings retorna un Settings válido."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test-key-12345"}):
-            get_settings.cache_clear()
-            settings = get_settings()
-            assert isinstance(settings, Settings)
+        """Test que get_settings retorna un Settings válido.
+
+        Sin reset_settings(): reutiliza el singleton si ya existe, para no
+        pagar otro parseo completo del entorno. Solo el test de cache
+        ejercita la reconstrucción explícitamente.
+        """
+        settings = get_settings()
+        assert isinstance(settings, Settings)
 
     def test_get_settings_raises_configuration_error(self):
         """Test que get_settings lanza ConfigurationError cuando falla."""
-        get_settings.cache_clear()
+        reset_settings()
         with patch("src.config.Settings", side_effect=ValidationError.from_exception_data("test", [])):
             with pytest.raises(ConfigurationError):
                 get_settings()
@@ -114,7 +85,7 @@ class TestGetSettings:
     def test_get_settings_is_cached(self):
         """Test que get_settings retorna la misma instancia (cache)."""
         with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test-key-12345"}):
-            get_settings.cache_clear()
+            reset_settings()
             settings1 = get_settings()
             settings2 = get_settings()
             assert settings1 is settings2
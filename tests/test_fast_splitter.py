@@ -0,0 +1,34 @@
+"""
+Tests para el divisor de texto de una sola pasada.
+"""
+from src.fast_splitter import FastSplitter
+
+
+class TestSplitText:
+    """Tests para split_text."""
+
+    def test_split_text_empty(self):
+        """Test que un texto vacío retorna lista vacía."""
+        assert FastSplitter().split_text("") == []
+
+    def test_split_text_respects_chunk_size(self):
+        """Test que ningún chunk excede chunk_size."""
+        splitter = FastSplitter(chunk_size=100, chunk_overlap=20)
+        chunks = splitter.split_text("Una frase corta de prueba. " * 50)
+
+        assert len(chunks) > 1
+        assert all(len(c) <= 100 for c in chunks)
+
+    def test_split_text_adversarial_boundaries_no_overflow(self):
+        """Regresión: límites justo sobre start forzaban avances de 1 carácter
+        y desbordaban el buffer preasignado de _pack (con numba, corrupción
+        silenciosa en vez de IndexError)."""
+        # Fin de oración cada ~201 chars seguido de un tramo largo sin límites
+        block = ("x" * 199 + ". ") + "y" * 805
+        text = block * 250
+
+        chunks = FastSplitter(1000, 200).split_text(text)
+
+        assert chunks
+        assert all(len(c) <= 1000 for c in chunks)
+        assert text.rstrip().endswith(chunks[-1][-50:])
@@ -0,0 +1,77 @@
+"""
+Tests de integración: indexan el corpus de ejemplo una sola vez por sesión.
+
+Requieren el modelo de embeddings real (descarga en el primer uso) y, para
+las consultas al LLM, un Ollama corriendo. Se excluyen del run unitario con
+el marcador `integration`.
+"""
+import urllib.request
+
+import pytest
+
+from src.config import get_settings
+
+# Los imports pesados (torch, faiss) viven dentro del fixture: colectar este
+# módulo en un run unitario no debe pagar su carga.
+
+pytestmark = pytest.mark.integration
+
+
+def _ollama_available() -> bool:
+    try:
+        urllib.request.urlopen(get_settings().ollama_base_url, timeout=2)
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture(scope="session")
+def indexed_rag(persistent_vectorstore):
+    """RAGSystem sobre el índice compartido de sesión.
+
+    El manejo de RAG_TEST_VS_CACHE y la reconstrucción por corpus
+    desactualizado viven en persistent_vectorstore (conftest).
+    """
+    from src.document_loader import DocumentLoader
+    from src.rag_system import RAGSystem
+
+    settings = get_settings()
+    return RAGSystem(
+        settings=settings,
+        vector_store=persistent_vectorstore,
+        document_loader=DocumentLoader(settings.chunk_size, settings.chunk_overlap),
+    )
+
+
+class TestIndexedRetrieval:
+    """Recuperación sobre el índice compartido (sin LLM)."""
+
+    def test_index_is_initialized(self, indexed_rag):
+        assert indexed_rag.vector_store.is_initialized()
+
+    @pytest.mark.parametrize(
+        "question,expected_substring",
+        [
+            ("¿Qué es el sistema RAG?", "RAG"),
+            ("¿Qué hace el document loader?", "Document Loader"),
+        ],
+    )
+    def test_retrieval_finds_relevant_chunks(self, indexed_rag, question, expected_substring):
+        results = indexed_rag.vector_store.similarity_search(question, k=2)
+
+        assert results
+        assert any(expected_substring.lower() in doc.page_content.lower() for doc, _ in results)
+
+
+class TestIndexedQuery:
+    """Consultas end-to-end contra el LLM local."""
+
+    def test_query_answers_with_sources(self, indexed_rag):
+        # Chequeo en runtime (no skipif): evita el timeout de red en colección
+        if not _ollama_available():
+            pytest.skip("Ollama no disponible")
+
+        result = indexed_rag.query("¿Qué es el sistema RAG?")
+
+        assert result.answer
+        assert result.sources
@@ -0,0 +1,39 @@
+"""
+Tests para los modelos de datos.
+"""
+from dataclasses import asdict
+
+import pytest
+from langchain_core.documents import Document
+
+from src.models import SourceDocument
+
+
+class TestFromLangchainDoc:
+    """Tests para SourceDocument.from_langchain_doc."""
+
+    def test_matches_validating_constructor(self):
+        """Test que la construcción directa produce campos consistentes."""
+        doc = Document(
+            page_content="Contenido de prueba " * 20,
+            metadata={"source": "/ruta/doc1.pdf", "page": 3},
+        )
+
+        built = SourceDocument.from_langchain_doc(doc, score=0.8)
+        rebuilt = SourceDocument(**asdict(built))
+
+        assert built == rebuilt
+        assert built.file_name == "doc1.pdf"
+        assert built.page == 3
+        assert built.similarity_score == pytest.approx(0.8)
+        assert built.preview.endswith("...")
+
+    def test_missing_metadata_defaults(self):
+        """Test los valores por defecto cuando falta metadata."""
+        doc = Document(page_content="corto")
+
+        built = SourceDocument.from_langchain_doc(doc, score=0.0)
+
+        assert built.file_name == "Unknown"
+        assert built.page == "N/A"
+        assert built.preview == "corto"